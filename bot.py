@@ -1,22 +0,0 @@
-from telegram import Update
-from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
-import os
-
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text("नमस्ते! मैं आपका Telegram Bot हूँ 🚀")
-
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text("कमांड लिस्ट:\n/start - बॉट शुरू करें\n/help - मदद पाएं")
-
-async def main():
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", help_command))
-    print("Bot चालू है...")
-    await app.run_polling()
-
-if name == "main":
-    import asyncio
-    asyncio.run(main())
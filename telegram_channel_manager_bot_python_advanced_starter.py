@@ -2,7 +2,9 @@
 Telegram Channel Manager Bot — Advanced Starter
 
 Requirements:
-  pip install "python-telegram-bot>=21,<22"
+  pip install "python-telegram-bot[rate-limiter,job-queue,http2]>=21,<22"
+  pip install orjson aiosqlite
+  pip install uvloop  # not needed on Windows
 
 Environment:
   - Set your token as an environment variable named TELEGRAM_TOKEN
@@ -12,8 +14,10 @@ What this bot can do:
   - /start, /help: basics
   - /setchannel <@username or numeric id>: connect a channel
   - /post <text>: post text to the connected channel
-  - Reply with /post_photo to a photo to publish it to the channel (with optional caption)
-  - /schedule_in <minutes> <text>: schedule a message to the channel
+  - Reply with /post_photo to a photo to publish it to the channel (with optional caption);
+    replying to a photo from an album publishes every item of that album the bot has received
+    (photos, videos, documents or audio)
+  - /schedule_in <minutes> <text>: schedule a message to the channel (survives restarts)
   - /pin_last: pin the last message sent by the bot in the channel
   - /addadmin <user_id>: add additional admin(s) who can control the bot
   - /status: show current config
@@ -21,50 +25,168 @@ What this bot can do:
 Notes:
   1) Add this bot as an ADMIN in your Telegram Channel with permissions to "Post Messages" and "Pin Messages".
   2) If you use @username for the channel, Telegram will resolve it automatically when sending.
-  3) Only admin_ids listed in config.json can use control commands.
+  3) Only admins stored in config.db can use control commands (an old config.json is imported on first run).
+     Control commands from anyone else are ignored.
 """
 
 from __future__ import annotations
 import os
-import json
+import sys
+import math
+import time
+import sqlite3
+import queue
+import asyncio
 import logging
-from dataclasses import dataclass, asdict
-from typing import Optional
-
-from telegram import Update, Message, ChatPermissions
-from telegram.constants import ParseMode
+import logging.handlers
+from contextlib import closing, suppress
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Union
+from uuid import uuid4
+
+import aiosqlite
+import orjson
+
+from telegram import (
+    Update, Message, ChatPermissions, InputMediaAudio, InputMediaDocument, InputMediaPhoto, InputMediaVideo,
+    ReactionTypeEmoji,
+)
+from telegram.constants import ParseMode, ReactionEmoji
+from telegram.error import BadRequest, NetworkError, TelegramError
 from telegram.ext import (
-    Application, CommandHandler, MessageHandler, CallbackContext, ContextTypes, filters
+    AIORateLimiter, Application, CommandHandler, MessageHandler, CallbackContext, ContextTypes, JobQueue, filters
 )
+from telegram.request import HTTPXRequest
+
+CONFIG_DB = "config.db"
+CONFIG_FILE = "config.json"  # legacy store, imported into CONFIG_DB on first run
+SAVE_DEBOUNCE_SECONDS = 0.5
+MAX_CONCURRENT_UPDATES = 256  # updates processed in parallel; outgoing calls are still paced by the rate limiter
+MAX_SCHEDULE_MINUTES = 60 * 24 * 365  # /schedule_in accepts up to one year ahead
+SCHEDULE_RETRY_SECONDS = 60  # delay before retrying a scheduled post after a network error
+MEDIA_GROUP_CACHE_SIZE = 50  # most recent albums remembered for /post_photo
+# Background sends yield to interactive ones (priority 0), see PriorityRateLimiter
+SCHEDULED_RATE_LIMIT_ARGS = {"priority": 10}
 
-CONFIG_FILE = "config.json"
-logging.basicConfig(
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    level=logging.INFO,
-)
 LOGGER = logging.getLogger("ChannelManagerBot")
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS admins (user_id INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS scheduled_posts (id TEXT PRIMARY KEY, chat_id TEXT, text TEXT, due_at REAL);
+"""
+# BotConfig fields stored as JSON-encoded values in the kv table
+KV_FIELDS = ("channel_id", "last_channel_message_id")
+
 @dataclass
 class BotConfig:
     channel_id: Optional[str] = None  # can be numeric id like -100123... or @username
     admin_ids: list[int] = None
     last_channel_message_id: Optional[int] = None
+    # Set whenever a kv field changes; config_saver() writes it out in the background
+    _dirty: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False, compare=False)
+    # O(1) mirror of admin_ids for membership checks; rebuild it whenever admin_ids changes
+    _admin_set: frozenset[int] = field(default=frozenset(), init=False, repr=False, compare=False)
+    # (key, text) for /status, rebuilt only when the key fields change
+    _status_cache: Optional[tuple[tuple, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._admin_set = frozenset(self.admin_ids or ())
 
     @staticmethod
-    def load(path: str = CONFIG_FILE) -> "BotConfig":
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return BotConfig(**data)
-        # Default: the first user who sends /start becomes admin
-        return BotConfig(channel_id=None, admin_ids=[])
-
-    def save(self, path: str = CONFIG_FILE) -> None:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+    def load(path: str = CONFIG_DB) -> "BotConfig":
+        # Runs once, before the event loop starts, so blocking sqlite3 is fine here
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.executescript(SCHEMA)
+            kv = dict(conn.execute("SELECT key, value FROM kv"))
+            admin_ids = [uid for (uid,) in conn.execute("SELECT user_id FROM admins ORDER BY user_id")]
+            if not kv and not admin_ids:
+                legacy = _import_legacy_json(conn)
+                if legacy:
+                    return legacy
+        # No admins yet means the first user who sends /start becomes admin
+        return BotConfig(admin_ids=admin_ids, **{k: orjson.loads(kv[k]) for k in KV_FIELDS if k in kv})
+
+    def kv_rows(self) -> list[tuple[str, str]]:
+        return [(k, orjson.dumps(getattr(self, k)).decode()) for k in KV_FIELDS]
+
+    def status_text(self) -> str:
+        # admin_ids only ever grows, so its length is enough to detect a change
+        key = (self.channel_id, len(self.admin_ids), self.last_channel_message_id)
+        if self._status_cache is None or self._status_cache[0] != key:
+            text = (
+                f"Channel: {self.channel_id}\n"
+                f"Admins: {self.admin_ids}\n"
+                f"Last Channel Msg ID: {self.last_channel_message_id}"
+            )
+            self._status_cache = (key, text)
+        return self._status_cache[1]
+
+    def mark_dirty(self) -> None:
+        """Request a (debounced) save from the background saver."""
+        self._dirty.set()
+
+def _import_legacy_json(conn: sqlite3.Connection, path: str = CONFIG_FILE) -> Optional[BotConfig]:
+    try:
+        with open(path, "rb") as f:
+            cfg = BotConfig(**orjson.loads(f.read()))
+    except FileNotFoundError:
+        return None
+    conn.executemany("INSERT OR REPLACE INTO kv VALUES (?, ?)", cfg.kv_rows())
+    conn.executemany("INSERT OR IGNORE INTO admins VALUES (?)", [(uid,) for uid in cfg.admin_ids or ()])
+    LOGGER.info("Imported %s into %s", path, CONFIG_DB)
+    return cfg
+
+async def open_db(path: str = CONFIG_DB) -> aiosqlite.Connection:
+    db = await aiosqlite.connect(path)
+    await db.execute("PRAGMA journal_mode=WAL")
+    await db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+async def save_kv(db: aiosqlite.Connection, cfg: BotConfig) -> None:
+    await db.executemany("INSERT OR REPLACE INTO kv VALUES (?, ?)", cfg.kv_rows())
+    await db.commit()
+
+async def save_admin(db: aiosqlite.Connection, uid: int) -> None:
+    await db.execute("INSERT OR IGNORE INTO admins VALUES (?)", (uid,))
+    await db.commit()
+
+async def save_scheduled(db: aiosqlite.Connection, job_id: str, chat_id: str, text: str, due_at: float) -> None:
+    await db.execute("INSERT INTO scheduled_posts VALUES (?, ?, ?, ?)", (job_id, chat_id, text, due_at))
+    await db.commit()
+
+async def delete_scheduled(db: aiosqlite.Connection, job_id: str) -> None:
+    await db.execute("DELETE FROM scheduled_posts WHERE id = ?", (job_id,))
+    await db.commit()
+
+async def config_saver(cfg: BotConfig, db: aiosqlite.Connection) -> None:
+    while True:
+        await cfg._dirty.wait()
+        # Let bursts of changes (e.g. /setchannel then /post) collapse into one write
+        await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+        cfg._dirty.clear()
+        try:
+            await save_kv(db, cfg)
+        except sqlite3.Error:
+            LOGGER.exception("Saving config failed, will retry")
+            cfg.mark_dirty()
 
 # -------------------- Helpers --------------------
 
+def setup_logging() -> logging.handlers.QueueListener:
+    # Handlers only enqueue records; a background thread does the actual (blocking)
+    # write to stderr, so logging never stalls the event loop. The caller must
+    # stop() the returned listener to flush what is still queued.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logging.basicConfig(
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        level=logging.INFO,
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    return listener
+
 def get_token() -> str:
     token = os.getenv("TELEGRAM_TOKEN")
     if not token:
@@ -73,24 +195,112 @@ def get_token() -> str:
         )
     return token
 
-async def is_admin(update: Update, cfg: BotConfig) -> bool:
-    user = update.effective_user
-    return user and cfg.admin_ids and user.id in cfg.admin_ids
-
-async def admin_guard(update: Update, context: ContextTypes.DEFAULT_TYPE, cfg: BotConfig) -> bool:
-    if not await is_admin(update, cfg):
-        await update.effective_message.reply_text("❌ यह कमांड केवल एडमिन्स के लिए है.")
+class PriorityRateLimiter(AIORateLimiter):
+    """AIORateLimiter that lets interactive requests go ahead of background ones.
+
+    ``rate_limit_args`` is a dict here rather than AIORateLimiter's plain int:
+    ``{"priority": N, "max_retries": M}``, both optional. Requests with N > 0 wait
+    until no priority-0 (interactive) request is in flight before entering the
+    limiter, so a burst of scheduled posts cannot queue up in front of command
+    replies. M is handed to AIORateLimiter as its per-request retry count.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._interactive_in_flight = 0
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, dict[str, Any], list[dict[str, Any]]]]],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: Optional[dict[str, int]],
+    ) -> Union[bool, dict[str, Any], list[dict[str, Any]]]:
+        rate_limit_args = rate_limit_args or {}
+        priority = rate_limit_args.get("priority", 0)
+        # AIORateLimiter expects an int (max retries) or None, never our dict
+        max_retries = rate_limit_args.get("max_retries")
+        if priority > 0:
+            await self._interactive_idle.wait()
+            return await super().process_request(callback, args, kwargs, endpoint, data, max_retries)
+
+        self._interactive_in_flight += 1
+        self._interactive_idle.clear()
+        try:
+            return await super().process_request(callback, args, kwargs, endpoint, data, max_retries)
+        finally:
+            self._interactive_in_flight -= 1
+            if not self._interactive_in_flight:
+                self._interactive_idle.set()
+
+def _maybe_html(text: str) -> Optional[str]:
+    # Only ask Telegram to parse HTML when the text looks like it has markup;
+    # plain text with a stray "<" or "&" would otherwise be rejected.
+    return ParseMode.HTML if ("<" in text and ">" in text) else None
+
+async def react(update: Update, context: ContextTypes.DEFAULT_TYPE, emoji: str) -> bool:
+    # Best effort: a failed reaction must never fail the command it decorates
+    try:
+        await context.bot.set_message_reaction(
+            chat_id=update.effective_chat.id,
+            message_id=update.message.message_id,
+            reaction=[ReactionTypeEmoji(emoji)],
+        )
+    except BadRequest:
+        return False  # reactions not allowed in this chat
+    except TelegramError as e:
+        LOGGER.warning("Setting reaction failed: %s", e)
         return False
     return True
 
+async def ack(update: Update, context: ContextTypes.DEFAULT_TYPE, fallback_text: str) -> None:
+    # A reaction on the command message is cheaper than a reply and does not
+    # count as a new chat message; fall back to a silent reply if it can't be set.
+    if not await react(update, context, ReactionEmoji.THUMBS_UP):
+        await update.message.reply_text(fallback_text, disable_notification=True)
+
+async def publish(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, send: Awaitable[Any], done_text: str
+) -> None:
+    # Confirm with 👍 only once Telegram has accepted the post: one extra call per
+    # command (two if reactions are not allowed and ack() falls back to a reply).
+    cfg: BotConfig = context.bot_data["cfg"]
+    try:
+        sent = await send
+    except TelegramError as e:
+        LOGGER.warning("Posting to %s failed: %s", cfg.channel_id, e)
+        await update.message.reply_text(f"❌ चैनल पर पोस्ट नहीं हो सका: {e.message}")
+        return
+    msg = sent[0] if isinstance(sent, tuple) else sent  # send_media_group returns a tuple
+    cfg.last_channel_message_id = msg.message_id
+    cfg.mark_dirty()
+    await ack(update, context, done_text)
+
 # -------------------- Commands --------------------
 
+HELP_TEXT = (
+    "उपलब्ध कमांड्स:\n"
+    "/setchannel <@username या -100...id> — चैनल जोड़ें\n"
+    "/post <टेक्स्ट> — चैनल पर पोस्ट करें\n"
+    "/post_photo (फोटो पर रिप्लाई करें) — फोटो चैनल पर पोस्ट करें\n"
+    "/schedule_in <मिनट> <टेक्स्ट> — शेड्यूल पोस्ट\n"
+    "/pin_last — बॉट द्वारा भेजे गए आखिरी चैनल मैसेज को पिन करें\n"
+    "/addadmin <user_id> — नया एडमिन जोड़ें\n"
+    "/status — वर्तमान सेटिंग्स\n"
+)
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
     user = update.effective_user
     if user and (not cfg.admin_ids):
         cfg.admin_ids = [user.id]
-        cfg.save()
+        cfg._admin_set = frozenset(cfg.admin_ids)
+        context.bot_data["admin_filter"].add_user_ids(user.id)
+        await save_admin(context.bot_data["db"], user.id)
         first_admin_note = "\n\n✅ आपको एडमिन बनाया गया है (पहला उपयोगकर्ता)."
     else:
         first_admin_note = ""
@@ -102,43 +312,24 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.message.reply_text(text)
 
 async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    text = (
-        "उपलब्ध कमांड्स:\n"
-        "/setchannel <@username या -100...id> — चैनल जोड़ें\n"
-        "/post <टेक्स्ट> — चैनल पर पोस्ट करें\n"
-        "/post_photo (फोटो पर रिप्लाई करें) — फोटो चैनल पर पोस्ट करें\n"
-        "/schedule_in <मिनट> <टेक्स्ट> — शेड्यूल पोस्ट\n"
-        "/pin_last — बॉट द्वारा भेजे गए आखिरी चैनल मैसेज को पिन करें\n"
-        "/addadmin <user_id> — नया एडमिन जोड़ें\n"
-        "/status — वर्तमान सेटिंग्स\n"
-    )
-    await update.message.reply_text(text)
+    await update.message.reply_text(HELP_TEXT)
 
 async def setchannel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    if not await admin_guard(update, context, cfg):
-        return
     if not context.args:
         await update.message.reply_text("उपयोग: /setchannel <@username या -100...id>")
         return
     channel = context.args[0]
     cfg.channel_id = channel
-    cfg.save()
+    cfg.mark_dirty()
     await update.message.reply_text(f"✅ चैनल सेट: {channel}\nबॉट को उस चैनल में एडमिन बनाना न भूलें.")
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    text = (
-        f"Channel: {cfg.channel_id}\n"
-        f"Admins: {cfg.admin_ids}\n"
-        f"Last Channel Msg ID: {cfg.last_channel_message_id}"
-    )
-    await update.message.reply_text(text)
+    await update.message.reply_text(cfg.status_text())
 
 async def addadmin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    if not await admin_guard(update, context, cfg):
-        return
     if not context.args:
         await update.message.reply_text("उपयोग: /addadmin <user_id>")
         return
@@ -147,31 +338,32 @@ async def addadmin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     except ValueError:
         await update.message.reply_text("user_id संख्यात्मक होना चाहिए.")
         return
-    if uid not in cfg.admin_ids:
-        cfg.admin_ids.append(uid)
-        cfg.save()
+    if uid in cfg._admin_set:
+        # Nothing changed: don't touch the filter or the database
+        await update.message.reply_text(f"ℹ️ {uid} पहले से एडमिन है.")
+        return
+    cfg.admin_ids.append(uid)
+    cfg._admin_set = frozenset(cfg.admin_ids)
+    context.bot_data["admin_filter"].add_user_ids(uid)
+    await save_admin(context.bot_data["db"], uid)
     await update.message.reply_text(f"✅ एडमिन जोड़ा गया: {uid}")
 
 async def post(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    if not await admin_guard(update, context, cfg):
-        return
     if not cfg.channel_id:
         await update.message.reply_text("पहले /setchannel चलाएँ.")
         return
-    if not context.args:
+    # Take the text verbatim from the message: context.args would collapse spaces and newlines
+    parts = update.message.text.split(maxsplit=1)
+    if len(parts) < 2:
         await update.message.reply_text("उपयोग: /post <टेक्स्ट>")
         return
-    text = " ".join(context.args)
-    msg = await context.bot.send_message(chat_id=cfg.channel_id, text=text, parse_mode=ParseMode.HTML, disable_web_page_preview=False)
-    cfg.last_channel_message_id = msg.message_id
-    cfg.save()
-    await update.message.reply_text("✅ पोस्ट कर दिया गया.")
+    text = parts[1]
+    send = context.bot.send_message(chat_id=cfg.channel_id, text=text, parse_mode=_maybe_html(text))
+    await publish(update, context, send, "✅ पोस्ट कर दिया गया.")
 
 async def post_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    if not await admin_guard(update, context, cfg):
-        return
     if not cfg.channel_id:
         await update.message.reply_text("पहले /setchannel चलाएँ.")
         return
@@ -179,71 +371,217 @@ async def post_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     if not reply or not reply.photo:
         await update.message.reply_text("किसी फोटो पर /post_photo रिप्लाई करें (कैप्शन वैकल्पिक).")
         return
-    caption = reply.caption or ""
-    file_id = reply.photo[-1].file_id  # best quality
-    msg = await context.bot.send_photo(chat_id=cfg.channel_id, photo=file_id, caption=caption)
-    cfg.last_channel_message_id = msg.message_id
-    cfg.save()
-    await update.message.reply_text("✅ फोटो पोस्ट कर दिया गया.")
+    album = context.bot_data.get("media_groups", {}).get(reply.media_group_id) if reply.media_group_id else None
+    if album and len(album) > 1:
+        # One sendMediaGroup call instead of a sendPhoto per picture
+        media = [_input_media(album[message_id]) for message_id in sorted(album)]
+        send = context.bot.send_media_group(chat_id=cfg.channel_id, media=media)
+    else:
+        caption = reply.caption or ""
+        file_id = reply.photo[-1].file_id  # best quality
+        send = context.bot.send_photo(chat_id=cfg.channel_id, photo=file_id, caption=caption)
+    await publish(update, context, send, "✅ फोटो पोस्ट कर दिया गया.")
+
+def _input_media(msg: Message) -> InputMediaAudio | InputMediaDocument | InputMediaPhoto | InputMediaVideo:
+    # remember_media_group() only buffers these four kinds, and Telegram only
+    # groups compatible kinds, so the rebuilt album is as valid as the original
+    if msg.photo:
+        return InputMediaPhoto(msg.photo[-1].file_id, caption=msg.caption)
+    if msg.video:
+        return InputMediaVideo(msg.video.file_id, caption=msg.caption)
+    if msg.audio:
+        return InputMediaAudio(msg.audio.file_id, caption=msg.caption)
+    return InputMediaDocument(msg.document.file_id, caption=msg.caption)
+
+async def remember_media_group(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # Telegram delivers an album as separate messages sharing a media_group_id;
+    # keep them so /post_photo on any one of them can forward the whole album.
+    # Items are keyed by message_id, so an edited item (edited_message update)
+    # replaces its earlier copy instead of being published twice.
+    msg = update.effective_message
+    if not msg.media_group_id:
+        return
+    groups: dict[str, dict[int, Message]] = context.bot_data.setdefault("media_groups", {})
+    if msg.media_group_id not in groups:
+        groups[msg.media_group_id] = {}
+        if len(groups) > MEDIA_GROUP_CACHE_SIZE:
+            del groups[next(iter(groups))]  # oldest album
+    groups[msg.media_group_id][msg.message_id] = msg
 
 async def schedule_in(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    if not await admin_guard(update, context, cfg):
-        return
     if not cfg.channel_id:
         await update.message.reply_text("पहले /setchannel चलाएँ.")
         return
-    if len(context.args) < 2:
+    parts = update.message.text.split(maxsplit=2)
+    if len(parts) < 3:
         await update.message.reply_text("उपयोग: /schedule_in <मिनट> <टेक्स्ट>")
         return
     try:
-        minutes = float(context.args[0])
+        minutes = float(parts[1])
     except ValueError:
         await update.message.reply_text("मिनट संख्या में दें.")
         return
-    text = " ".join(context.args[1:])
+    # float() also accepts "inf"/"nan"/"1e12", which the JobQueue cannot schedule
+    if not math.isfinite(minutes) or not 0 <= minutes <= MAX_SCHEDULE_MINUTES:
+        await update.message.reply_text(f"मिनट 0 से {MAX_SCHEDULE_MINUTES} के बीच दें.")
+        return
+    text = parts[2]
+
+    # Arm the job first, then persist it so on_startup() can replay it after a restart.
+    # aiosqlite runs statements in submission order, so the INSERT is queued before
+    # the job's DELETE even when minutes is 0.
+    job_id = f"post-{uuid4().hex}"
+    arm_scheduled_post(context.job_queue, job_id, {"chat_id": cfg.channel_id, "text": text}, minutes * 60)
+    await save_scheduled(context.bot_data["db"], job_id, cfg.channel_id, text, time.time() + minutes * 60)
+    await ack(update, context, f"⏱️ शेड्यूल हो गया — {minutes} मिनट बाद पोस्ट होगा.")
 
-    async def job_callback(ctx: CallbackContext) -> None:
-        msg = await ctx.bot.send_message(chat_id=cfg.channel_id, text=text, parse_mode=ParseMode.HTML)
+async def scheduled_post(context: CallbackContext) -> None:
+    cfg: BotConfig = context.bot_data["cfg"]
+    job = context.job
+    text = job.data["text"]
+    try:
+        msg = await context.bot.send_message(
+            chat_id=job.data["chat_id"],
+            text=text,
+            parse_mode=_maybe_html(text),
+            rate_limit_args=SCHEDULED_RATE_LIMIT_ARGS,
+        )
+    except NetworkError as e:
+        # Transient (includes TimedOut): keep the row and try again shortly
+        LOGGER.warning("Scheduled post %s failed: %s; retrying in %d s", job.name, e, SCHEDULE_RETRY_SECONDS)
+        arm_scheduled_post(context.job_queue, job.name, job.data, SCHEDULE_RETRY_SECONDS)
+        return
+    except Exception:
+        LOGGER.exception("Scheduled post %s to %s failed, dropping it", job.name, job.data["chat_id"])
+        await delete_scheduled(context.bot_data["db"], job.name)
+        return
+    await delete_scheduled(context.bot_data["db"], job.name)
+    # The post goes to the channel captured at schedule time; only remember its id
+    # if that is still the configured channel, otherwise /pin_last would pin an
+    # id from the old channel in the new one.
+    if job.data["chat_id"] == cfg.channel_id:
         cfg.last_channel_message_id = msg.message_id
-        cfg.save()
+        cfg.mark_dirty()
 
-    job = context.job_queue.run_once(job_callback, when=minutes * 60)
-    await update.message.reply_text(f"⏱️ शेड्यूल हो गया — {minutes} मिनट बाद पोस्ट होगा.")
+def arm_scheduled_post(job_queue: JobQueue, job_id: str, data: dict[str, str], when: float) -> None:
+    # No misfire grace limit: jobs re-armed in post_init can come due before the
+    # JobQueue starts, and APScheduler's default 1 s grace would silently skip them.
+    job_queue.run_once(scheduled_post, when=when, data=data, name=job_id, job_kwargs={"misfire_grace_time": None})
 
 async def pin_last(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     cfg: BotConfig = context.bot_data["cfg"]
-    if not await admin_guard(update, context, cfg):
-        return
     if not cfg.channel_id or not cfg.last_channel_message_id:
         await update.message.reply_text("कोई हालिया चैनल मैसेज नहीं मिला.")
         return
     try:
         await context.bot.pin_chat_message(chat_id=cfg.channel_id, message_id=cfg.last_channel_message_id)
-        await update.message.reply_text("📌 पिन कर दिया गया.")
     except Exception as e:
         LOGGER.exception("Pin failed: %s", e)
         await update.message.reply_text("पिन करते समय त्रुटि हुई. सुनिश्चित करें कि बॉट के पास पिन करने की अनुमति है.")
+    else:
+        await ack(update, context, "📌 पिन कर दिया गया.")
+
+# -------------------- Lifecycle --------------------
+
+async def on_startup(app: Application) -> None:
+    db = await open_db()
+    app.bot_data["db"] = db
+    app.bot_data["saver_task"] = asyncio.create_task(config_saver(app.bot_data["cfg"], db))
+
+    # Re-arm posts scheduled before the last shutdown; overdue ones go out right away
+    async with db.execute("SELECT id, chat_id, text, due_at FROM scheduled_posts") as cursor:
+        rows = await cursor.fetchall()
+    now = time.time()
+    restored = 0
+    for job_id, chat_id, text, due_at in rows:
+        try:
+            arm_scheduled_post(app.job_queue, job_id, {"chat_id": chat_id, "text": text}, max(0.0, due_at - now))
+        except (OverflowError, TypeError, ValueError):
+            # A bad row must not keep the bot from starting
+            LOGGER.warning("Dropping scheduled post %s with invalid due time %r", job_id, due_at)
+            await delete_scheduled(db, job_id)
+        else:
+            restored += 1
+    if restored:
+        LOGGER.info("Restored %d scheduled post(s)", restored)
+
+async def on_shutdown(app: Application) -> None:
+    task = app.bot_data.pop("saver_task", None)
+    if task:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    db = app.bot_data.pop("db", None)
+    if db:
+        # Flush unconditionally: the saver may have been cancelled mid-write
+        await save_kv(db, app.bot_data["cfg"])
+        await db.close()
 
 # -------------------- Main --------------------
 
 def main() -> None:
+    log_listener = setup_logging()
+    try:
+        run_bot()
+    finally:
+        log_listener.stop()  # flushes queued records, including startup errors
+
+def run_bot() -> None:
     token = get_token()
-    app = Application.builder().token(token).build()
+    if sys.platform != "win32":
+        import uvloop
+        uvloop.install()
+
+    # Client-side throttling: 30 msg/s overall, 20 msg/min per group/channel.
+    # 429 "retry after" responses are retried transparently by the limiter.
+    rate_limiter = PriorityRateLimiter(
+        overall_max_rate=30,
+        overall_time_period=1,
+        group_max_rate=20,
+        group_time_period=60,
+        max_retries=3,
+    )
+    # HTTP/2 lets concurrent handlers multiplex over one TLS connection instead of
+    # opening a new one per request; getUpdates gets its own small pool.
+    request = HTTPXRequest(connection_pool_size=256, http_version="2", read_timeout=30, write_timeout=30)
+    get_updates_request = HTTPXRequest(connection_pool_size=8, http_version="2")
+    app = (
+        Application.builder()
+        .token(token)
+        .request(request)
+        .get_updates_request(get_updates_request)
+        .rate_limiter(rate_limiter)
+        # Handlers only mutate BotConfig synchronously (no await in between), and
+        # persistence goes through the saver task / aiosqlite, so this is safe.
+        .concurrent_updates(MAX_CONCURRENT_UPDATES)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
 
     # Load config into bot_data so all handlers can access
     cfg = BotConfig.load()
     app.bot_data["cfg"] = cfg
-
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", help_cmd))
-    app.add_handler(CommandHandler("setchannel", setchannel))
-    app.add_handler(CommandHandler("status", status))
-    app.add_handler(CommandHandler("addadmin", addadmin))
-    app.add_handler(CommandHandler("post", post))
-    app.add_handler(CommandHandler("post_photo", post_photo))
-    app.add_handler(CommandHandler("schedule_in", schedule_in))
-    app.add_handler(CommandHandler("pin_last", pin_last))
+    # Control commands are only dispatched for admins; updates from anyone else
+    # are dropped by the filter before a handler coroutine is created.
+    # /start and /addadmin extend it at runtime.
+    admin_filter = filters.User(user_id=cfg._admin_set)
+    app.bot_data["admin_filter"] = admin_filter
+
+    for name, callback in (("start", start), ("help", help_cmd), ("status", status)):
+        app.add_handler(CommandHandler(name, callback))
+    for name, callback in (
+        ("setchannel", setchannel),
+        ("addadmin", addadmin),
+        ("post", post),
+        ("post_photo", post_photo),
+        ("schedule_in", schedule_in),
+        ("pin_last", pin_last),
+    ):
+        app.add_handler(CommandHandler(name, callback, filters=admin_filter))
+    album_items = filters.PHOTO | filters.VIDEO | filters.AUDIO | filters.Document.ALL
+    app.add_handler(MessageHandler(album_items & admin_filter, remember_media_group))
 
     LOGGER.info("Bot started. Press Ctrl+C to stop.")
     app.run_polling(close_loop=False)